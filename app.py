@@ -1,11 +1,65 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
+import functools
+import hashlib
 import json
 import io
 import base64
 from typing import Dict, List, Any, Optional, Tuple
 import re
 import os
+from rapidfuzz import fuzz, process as rf_process
+
+try:
+    import pyarrow as pa
+    from pyarrow import csv as pacsv
+except ImportError:
+    pa = None
+    pacsv = None
+
+try:
+    from rustpy_xlsxwriter import FastExcel
+except ImportError:
+    FastExcel = None
+
+try:
+    import python_calamine  # noqa: F401 - Rust Excel reader used via pandas
+    # pandas only grew the calamine engine in 2.2, so an importable library
+    # alone is not enough on older installs
+    _HAS_CALAMINE = tuple(int(p) for p in pd.__version__.split('.')[:2]) >= (2, 2)
+except ImportError:
+    _HAS_CALAMINE = False
+
+try:
+    import xlsxwriter  # noqa: F401 - streaming Excel writer used via pandas
+    _HAS_XLSXWRITER = True
+except ImportError:
+    _HAS_XLSXWRITER = False
+
+try:
+    import xxhash
+
+    def _content_key(data: bytes) -> str:
+        # xxh3 is a SIMD-accelerated non-cryptographic hash; the key only
+        # needs to identify the upload locally
+        return xxhash.xxh3_64(data).hexdigest()
+except ImportError:
+    def _content_key(data: bytes) -> str:
+        return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+try:
+    import orjson
+
+    def _json_dumps(obj) -> str:
+        return orjson.dumps(obj).decode('utf-8')
+except ImportError:
+    _json_dumps = json.dumps
+
+# Precompiled patterns for the cleaning paths that run on every conversion
+_PRICE_STRIP_RE = re.compile(r'[^\d.,]')
+_URL_SPLIT_RE = re.compile(r'[;,\|\n]')
+_ATTR_CLEAN_RE = re.compile(r'[^\w]')
 
 # Page configuration
 st.set_page_config(
@@ -17,10 +71,30 @@ st.set_page_config(
 
 class SalaazConverter:
     """
-    Main converter class for transforming e-commerce CSV/Excel files 
+    Main converter class for transforming e-commerce CSV/Excel files
     to Salaaz marketplace bulk upload format.
     """
-    
+
+    # Keyword synonym families for common category mappings
+    KEYWORD_MAPPINGS = {
+        'apparel': ['clothing', 'clothes'],
+        'clothing': ['apparel', 'clothes', 'fashion'],
+        'accessories': ['jewelry', 'jewellery', 'watches'],
+        'traditional': ['ceremonial', 'cultural'],
+        'health': ['beauty', 'wellness'],
+        'home': ['house', 'living', 'decor'],
+        'electronics': ['tech', 'digital'],
+        'books': ['literature', 'reading']
+    }
+
+    # Keyword family sets and full vocabulary, derived once from the table
+    # above so keyword matching never rebuilds them
+    _KEYWORD_FAMILIES = {
+        keyword: frozenset(synonyms) | {keyword}
+        for keyword, synonyms in KEYWORD_MAPPINGS.items()
+    }
+    _KEYWORD_VOCAB = frozenset().union(*_KEYWORD_FAMILIES.values())
+
     def __init__(self):
         self.SALAAZ_REQUIRED_COLUMNS = [
             'name', 'description', 'price', 'brand', 'category_id'
@@ -33,11 +107,22 @@ class SalaazConverter:
         ]
         
         self.ALL_SALAAZ_COLUMNS = self.SALAAZ_REQUIRED_COLUMNS + self.SALAAZ_OPTIONAL_COLUMNS
+
+        # Frozen views for O(1) membership tests and set intersections
+        self.SALAAZ_REQUIRED_SET = frozenset(self.SALAAZ_REQUIRED_COLUMNS)
+        self.SALAAZ_OPTIONAL_SET = frozenset(self.SALAAZ_OPTIONAL_COLUMNS)
+
+        # Free-text fields stored as Arrow-backed strings in the output
+        self.SALAAZ_TEXT_COLUMNS = [
+            'name', 'description', 'brand', 'certification',
+            'country_of_origin', 'details', 'care', 'size_fit'
+        ]
         
         # Load category mappings
         self.categories_df = None
         self.sub_categories_df = None
         self.sub_sub_categories_df = None
+        self._cat_cache: Dict[Tuple, Tuple] = {}
         self._load_category_mappings()
         
         # Common e-commerce platform mappings
@@ -73,68 +158,99 @@ class SalaazConverter:
                 'category_source': ['Categories', 'Product categories', 'Category']
             }
         }
-    
+
+        # Lowercased copy of the platform mappings, built once so detection
+        # never re-lowercases the candidate column names per call
+        self._PLATFORM_MAPPINGS_LC = {
+            platform: {field: [col.lower() for col in cols] for field, cols in mapping.items()}
+            for platform, mapping in self.PLATFORM_MAPPINGS.items()
+        }
+
     def detect_platform(self, columns: List[str]) -> Optional[str]:
         """Detect the e-commerce platform based on column names."""
-        column_set = set([col.lower() for col in columns])
-        
-        scores = {}
-        for platform, mappings in self.PLATFORM_MAPPINGS.items():
+        return _detect_platform_cached(tuple(columns), self)
+
+    def _detect_platform_impl(self, columns: List[str]) -> Optional[str]:
+        """Uncached platform detection; called via the module-level cache."""
+        column_set = frozenset(col.lower() for col in columns)
+
+        best_platform = None
+        best_ratio = 0.0
+        for platform, mappings in self._PLATFORM_MAPPINGS_LC.items():
+            total_possible = len(mappings)
+            if total_possible == 0:
+                continue
+
             score = 0
-            total_possible = 0
-            
-            for salaaz_field, possible_columns in mappings.items():
-                total_possible += 1
+            for field_index, possible_columns in enumerate(mappings.values()):
+                # Give up on this platform once even matching every
+                # remaining field could not beat the current best
+                if (score + total_possible - field_index) / total_possible <= best_ratio:
+                    break
                 for possible_col in possible_columns:
-                    if possible_col.lower() in column_set:
+                    if possible_col in column_set:
                         score += 1
                         break
-            
-            scores[platform] = score / total_possible if total_possible > 0 else 0
-        
+
+            ratio = score / total_possible
+            if ratio > best_ratio:
+                best_platform, best_ratio = platform, ratio
+
+            # A perfect score cannot be beaten - skip the remaining platforms
+            if score == total_possible:
+                break
+
         # Return platform with highest score if above threshold
-        best_platform = max(scores.items(), key=lambda x: x[1])
-        return best_platform[0] if best_platform[1] > 0.3 else None
+        return best_platform if best_ratio > 0.3 else None
     
     def suggest_mapping(self, source_columns: List[str], platform: Optional[str] = None) -> Dict[str, str]:
         """Suggest column mapping from source to Salaaz format."""
+        return _suggest_mapping_cached(tuple(source_columns), platform, self)
+
+    def _suggest_mapping_impl(self, source_columns: List[str], platform: Optional[str] = None) -> Dict[str, str]:
+        """Uncached mapping suggestion; called via the module-level cache."""
         mapping = {}
-        source_lower = [col.lower() for col in source_columns]
-        
+
+        # Lowercase -> original column dict, built once; keeps the first
+        # occurrence to match the old list-scan behaviour
+        lc_to_orig: Dict[str, str] = {}
+        for col in source_columns:
+            lc_to_orig.setdefault(col.lower(), col)
+
         # Use platform-specific mappings if detected
-        if platform and platform in self.PLATFORM_MAPPINGS:
-            platform_mappings = self.PLATFORM_MAPPINGS[platform]
-            
+        if platform and platform in self._PLATFORM_MAPPINGS_LC:
+            platform_mappings = self._PLATFORM_MAPPINGS_LC[platform]
+
             for salaaz_field, possible_columns in platform_mappings.items():
                 for possible_col in possible_columns:
-                    if possible_col.lower() in source_lower:
-                        original_col = source_columns[source_lower.index(possible_col.lower())]
+                    original_col = lc_to_orig.get(possible_col)
+                    if original_col is not None:
                         mapping[salaaz_field] = original_col
                         break
-        
+
         # Fallback to fuzzy matching for unmapped fields
         for salaaz_field in self.ALL_SALAAZ_COLUMNS:
             if salaaz_field not in mapping:
-                best_match = self._fuzzy_match_column(salaaz_field, source_columns)
+                best_match = self._fuzzy_match_column(salaaz_field, lc_to_orig)
                 if best_match:
                     mapping[salaaz_field] = best_match
-        
+
         return mapping
-    
-    def _fuzzy_match_column(self, target: str, source_columns: List[str]) -> Optional[str]:
+
+    def _fuzzy_match_column(self, target: str, lc_to_orig: Dict[str, str]) -> Optional[str]:
         """Find the best fuzzy match for a column name."""
         target_lower = target.lower()
-        
+
         # Exact match
-        for col in source_columns:
-            if col.lower() == target_lower:
-                return col
-        
+        exact = lc_to_orig.get(target_lower)
+        if exact is not None:
+            return exact
+
         # Partial match
-        for col in source_columns:
-            if target_lower in col.lower() or col.lower() in target_lower:
+        for col_lc, col in lc_to_orig.items():
+            if target_lower in col_lc or col_lc in target_lower:
                 return col
-        
+
         # Keyword matching
         keywords = {
             'name': ['title', 'name', 'product'],
@@ -149,36 +265,63 @@ class SalaazConverter:
         
         if target in keywords:
             for keyword in keywords[target]:
-                for col in source_columns:
-                    if keyword in col.lower():
+                for col_lc, col in lc_to_orig.items():
+                    if keyword in col_lc:
                         return col
-        
+
         return None
     
     def _load_category_mappings(self):
-        """Load category mapping CSV files."""
+        """Load category mapping CSV files and build hash-indexed lookups."""
+        self._cat_cache.clear()
+
+        # Exact name -> id dicts (one per level) and parent-id -> sub-frame
+        # dicts, so lookups are O(1) instead of scanning the DataFrames
+        self._cat_exact: Dict[str, int] = {}
+        self._subcat_exact: Dict[str, int] = {}
+        self._subsubcat_exact: Dict[str, int] = {}
+        self._subcat_by_parent: Dict[int, pd.DataFrame] = {}
+        self._subsubcat_by_parent: Dict[int, pd.DataFrame] = {}
         try:
-            # Load main categories
-            if os.path.exists('categories.csv'):
-                self.categories_df = pd.read_csv('categories.csv', header=None,
-                                               names=['id', 'name', 'description', 'active', 'created_at', 'updated_at'])
-            
-            # Load sub-categories
-            if os.path.exists('sub_categories.csv'):
-                self.sub_categories_df = pd.read_csv('sub_categories.csv', header=None,
-                                                   names=['id', 'name', 'description', 'active', 'created_at', 'updated_at', 'category_id'])
-            
-            # Load sub-sub-categories
-            if os.path.exists('sub_sub_categories.csv'):
-                self.sub_sub_categories_df = pd.read_csv('sub_sub_categories.csv', header=None,
-                                                       names=['id', 'name', 'description', 'active', 'created_at', 'updated_at', 'sub_category_id'])
+            # The parsed frames are cached across converter instantiations;
+            # Streamlit recreates the converter on every rerun
+            (self.categories_df,
+             self.sub_categories_df,
+             self.sub_sub_categories_df) = _load_all_categories()
+
+            if self.categories_df is not None:
+                self._cat_exact = self._build_exact_lookup(self.categories_df)
+
+            if self.sub_categories_df is not None:
+                self._subcat_exact = self._build_exact_lookup(self.sub_categories_df)
+                self._subcat_by_parent = dict(tuple(self.sub_categories_df.groupby('category_id')))
+
+            if self.sub_sub_categories_df is not None:
+                self._subsubcat_exact = self._build_exact_lookup(self.sub_sub_categories_df)
+                self._subsubcat_by_parent = dict(tuple(self.sub_sub_categories_df.groupby('sub_category_id')))
         except Exception as e:
             st.warning(f"Could not load category mapping files: {str(e)}")
+
+    @classmethod
+    def _extract_keyword_terms(cls, text: str) -> frozenset:
+        """Return the keyword vocabulary terms contained in a lowercase string."""
+        return frozenset(term for term in cls._KEYWORD_VOCAB if term in text)
+
+    @staticmethod
+    def _build_exact_lookup(df: pd.DataFrame) -> Dict[str, int]:
+        """Build a lowercase name -> id dict, keeping the first occurrence."""
+        lookup: Dict[str, int] = {}
+        for name_lc, row_id in zip(df['_name_lc'], df['id']):
+            lookup.setdefault(name_lc, int(row_id))
+        return lookup
     
-    def parse_shopify_category(self, category_string: str) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    @staticmethod
+    @functools.lru_cache(maxsize=4096)
+    def parse_shopify_category(category_string: str) -> Tuple[Optional[str], Optional[str], Optional[str]]:
         """
         Parse Shopify nested category string into individual category levels.
-        
+        Results are cached since exports repeat the same strings heavily.
+
         Args:
             category_string: String like "Apparel & Accessories > Clothing > Traditional & Ceremonial Clothing"
             
@@ -211,34 +354,45 @@ class SalaazConverter:
         Returns:
             Tuple of (category_id, sub_category_id, sub_sub_category_id)
         """
+        cache_key = (category_name, sub_category_name, sub_sub_category_name)
+        if cache_key in self._cat_cache:
+            return self._cat_cache[cache_key]
+
         category_id = None
         sub_category_id = None
         sub_sub_category_id = None
         
-        # Find main category
+        # Find main category - exact dict hit first, fuzzy fallback
         if category_name and self.categories_df is not None:
-            category_id = self._find_best_match(category_name, self.categories_df, 'name', 'id')
-        
+            category_id = self._cat_exact.get(category_name.lower().strip())
+            if category_id is None:
+                category_id = self._find_best_match(category_name, self.categories_df, 'name', 'id')
+
         # Find sub-category
         if sub_category_name and self.sub_categories_df is not None:
             # Filter by parent category if found
             if category_id:
-                filtered_df = self.sub_categories_df[self.sub_categories_df['category_id'] == category_id]
+                filtered_df = self._subcat_by_parent.get(category_id, self.sub_categories_df.iloc[0:0])
             else:
                 filtered_df = self.sub_categories_df
-            
-            sub_category_id = self._find_best_match(sub_category_name, filtered_df, 'name', 'id')
-        
+                sub_category_id = self._subcat_exact.get(sub_category_name.lower().strip())
+
+            if sub_category_id is None:
+                sub_category_id = self._find_best_match(sub_category_name, filtered_df, 'name', 'id')
+
         # Find sub-sub-category
         if sub_sub_category_name and self.sub_sub_categories_df is not None:
             # Filter by parent sub-category if found
             if sub_category_id:
-                filtered_df = self.sub_sub_categories_df[self.sub_sub_categories_df['sub_category_id'] == sub_category_id]
+                filtered_df = self._subsubcat_by_parent.get(sub_category_id, self.sub_sub_categories_df.iloc[0:0])
             else:
                 filtered_df = self.sub_sub_categories_df
-            
-            sub_sub_category_id = self._find_best_match(sub_sub_category_name, filtered_df, 'name', 'id')
-        
+                sub_sub_category_id = self._subsubcat_exact.get(sub_sub_category_name.lower().strip())
+
+            if sub_sub_category_id is None:
+                sub_sub_category_id = self._find_best_match(sub_sub_category_name, filtered_df, 'name', 'id')
+
+        self._cat_cache[cache_key] = (category_id, sub_category_id, sub_sub_category_id)
         return category_id, sub_category_id, sub_sub_category_id
     
     def _find_best_match(self, search_term: str, df: pd.DataFrame, search_column: str, return_column: str) -> Optional[int]:
@@ -256,46 +410,49 @@ class SalaazConverter:
         """
         if df.empty or not search_term:
             return None
-        
+
         search_term_lower = search_term.lower().strip()
-        
+
+        # Use the lowercase names precomputed at load time when available
+        if search_column == 'name' and '_name_lc' in df.columns:
+            category_names = df['_name_lc'].to_numpy()
+        else:
+            category_names = df[search_column].astype(str).str.lower().str.strip().to_numpy()
+
         # Exact match first
-        exact_matches = df[df[search_column].str.lower() == search_term_lower]
-        if not exact_matches.empty:
-            return int(exact_matches.iloc[0][return_column])
-        
-        # Partial match - search term contains category name
-        for _, row in df.iterrows():
-            category_name = str(row[search_column]).lower().strip()
-            if category_name in search_term_lower or search_term_lower in category_name:
-                return int(row[return_column])
-        
-        # Keyword matching for common mappings
-        keyword_mappings = {
-            'apparel': ['clothing', 'clothes'],
-            'clothing': ['apparel', 'clothes', 'fashion'],
-            'accessories': ['jewelry', 'jewellery', 'watches'],
-            'traditional': ['ceremonial', 'cultural'],
-            'health': ['beauty', 'wellness'],
-            'home': ['house', 'living', 'decor'],
-            'electronics': ['tech', 'digital'],
-            'books': ['literature', 'reading']
-        }
-        
-        # Check if search term matches any keywords
-        for _, row in df.iterrows():
-            category_name = str(row[search_column]).lower().strip()
-            
-            # Direct keyword matching
-            for keyword, synonyms in keyword_mappings.items():
-                if keyword in search_term_lower:
-                    if any(synonym in category_name for synonym in synonyms + [keyword]):
-                        return int(row[return_column])
-                
-                if keyword in category_name:
-                    if any(synonym in search_term_lower for synonym in synonyms + [keyword]):
-                        return int(row[return_column])
-        
+        exact_indices = np.flatnonzero(category_names == search_term_lower)
+        if exact_indices.size > 0:
+            return int(df.iloc[exact_indices[0]][return_column])
+
+        # Partial match - C-level fuzzy scan over all candidates at once
+        match = rf_process.extractOne(
+            search_term_lower, category_names,
+            scorer=fuzz.partial_ratio, score_cutoff=80
+        )
+        if match is not None:
+            return int(df.iloc[match[2]][return_column])
+
+        # Keyword matching for common mappings, using the precomputed
+        # per-category term sets instead of substring loops per row
+        search_terms = self._extract_keyword_terms(search_term_lower)
+        if not search_terms:
+            # No vocabulary term appears in the search string, so the row
+            # scan below could never match - common for sub-category names
+            return None
+
+        if '_kw_terms' in df.columns:
+            row_term_sets = df['_kw_terms'].to_numpy()
+        else:
+            row_term_sets = [self._extract_keyword_terms(name) for name in category_names]
+
+        for position, row_terms in enumerate(row_term_sets):
+            for keyword, family in self._KEYWORD_FAMILIES.items():
+                if keyword in search_terms and family & row_terms:
+                    return int(df.iloc[position][return_column])
+
+                if keyword in row_terms and family & search_terms:
+                    return int(df.iloc[position][return_column])
+
         return None
     
     def map_shopify_categories(self, df: pd.DataFrame, category_column: str) -> pd.DataFrame:
@@ -305,54 +462,50 @@ class SalaazConverter:
         Args:
             df: DataFrame containing Shopify data
             category_column: Name of the column containing category information
-            
+
         Returns:
-            DataFrame with additional columns for category IDs
+            DataFrame indexed like the input, containing only the category ID columns
         """
-        result_df = df.copy()
-        
-        # Initialize category ID columns
-        result_df['category_id'] = None
-        result_df['sub_category_id'] = None
-        result_df['sub_sub_category_id'] = None
-        
+        # Only the three ID columns are consumed by the caller, so build just
+        # those instead of copying the whole input frame
+        result_df = pd.DataFrame(index=df.index)
+
         if category_column not in df.columns:
             st.warning(f"Category column '{category_column}' not found. Using default category ID.")
             result_df['category_id'] = 1  # Default category
+            result_df['sub_category_id'] = None
+            result_df['sub_sub_category_id'] = None
             return result_df
-        
-        # Process each row
-        for idx, row in df.iterrows():
-            category_string = row[category_column]
-            
-            # Parse nested category
+
+        # Category strings repeat heavily in real exports, so resolve each
+        # distinct string once and map the results back instead of running
+        # the fuzzy lookup per row
+        category_strings = df[category_column].astype(str)
+        lookup = {}
+        for category_string in category_strings.unique():
             category, sub_category, sub_sub_category = self.parse_shopify_category(category_string)
-            
-            # Find matching IDs
-            category_id, sub_category_id, sub_sub_category_id = self.find_category_ids(
+            lookup[category_string] = self.find_category_ids(
                 category, sub_category, sub_sub_category
             )
-            
-            # Set the IDs
-            result_df.at[idx, 'category_id'] = category_id if category_id else 1  # Default to category 1
-            result_df.at[idx, 'sub_category_id'] = sub_category_id if sub_category_id else 1
-            result_df.at[idx, 'sub_sub_category_id'] = sub_sub_category_id if sub_sub_category_id else 1
-        
+
+        triples = category_strings.map(lookup)
+        id_columns = ['category_id', 'sub_category_id', 'sub_sub_category_id']
+        id_df = pd.DataFrame(triples.tolist(), index=df.index, columns=id_columns)
+        result_df[id_columns] = id_df.fillna(1).astype(int)  # Default to category 1
+
         return result_df
     
     def transform_data(self, df: pd.DataFrame, mapping: Dict[str, str], platform: Optional[str] = None) -> pd.DataFrame:
         """Transform source data to Salaaz format using the provided mapping."""
-        result_data = {}
-        
-        # Initialize all Salaaz columns
-        for col in self.ALL_SALAAZ_COLUMNS:
-            result_data[col] = [None] * len(df)
-        
-        # Map the data
+        # Initialize all Salaaz columns as missing
+        result_data = {col: pd.Series([None] * len(df)) for col in self.ALL_SALAAZ_COLUMNS}
+
+        # Map the data column-wise; whole Series moves avoid the per-cell
+        # Python lists that tolist() materialized
         for salaaz_col, source_col in mapping.items():
             if source_col and source_col in df.columns:
-                result_data[salaaz_col] = df[source_col].tolist()
-        
+                result_data[salaaz_col] = df[source_col].reset_index(drop=True)
+
         # Create result DataFrame
         result_df = pd.DataFrame(result_data)
         
@@ -391,14 +544,14 @@ class SalaazConverter:
         
         # Clean and validate price column
         if 'price' in result_df.columns:
-            result_df['price'] = result_df['price'].apply(self._clean_price)
+            result_df['price'] = self._clean_price_series(result_df['price'])
         
         # Handle variant attributes
         result_df = self._process_variant_attributes(result_df, source_df, mapping)
         
         # Clean image URLs
         if 'image_urls' in result_df.columns:
-            result_df['image_urls'] = result_df['image_urls'].apply(self._clean_image_urls)
+            result_df['image_urls'] = self._clean_image_urls_series(result_df['image_urls'])
         
         # Set default values for required fields
         result_df = self._set_default_values(result_df)
@@ -415,30 +568,30 @@ class SalaazConverter:
         
         # Remove completely empty rows
         result_df = result_df.dropna(how='all')
-        
+
+        # Store free-text columns as Arrow-backed strings - far smaller than
+        # object-dtype Python strings for description-heavy catalogs
+        text_dtype = 'string[pyarrow]' if pa is not None else 'string'
+        for field in self.SALAAZ_TEXT_COLUMNS:
+            if field in result_df.columns:
+                result_df[field] = result_df[field].astype(text_dtype)
+
         return result_df
     
-    def _clean_price(self, price_value) -> Optional[str]:
-        """Clean and validate price values."""
-        if pd.isna(price_value):
-            return None
-        
+    def _clean_price_series(self, prices: pd.Series) -> pd.Series:
+        """Clean and validate a whole price column in one vectorized pass."""
         # Remove currency symbols and extra whitespace
-        price_str = str(price_value).strip()
-        price_str = re.sub(r'[^\d.,]', '', price_str)
-        
+        cleaned = prices.astype('string').str.strip().str.replace(_PRICE_STRIP_RE, '', regex=True)
+
         # Handle different decimal separators
-        if ',' in price_str and '.' in price_str:
-            # Assume comma is thousands separator
-            price_str = price_str.replace(',', '')
-        elif ',' in price_str:
-            # Assume comma is decimal separator
-            price_str = price_str.replace(',', '.')
-        
-        try:
-            return str(float(price_str))
-        except (ValueError, TypeError):
-            return None
+        has_comma = cleaned.str.contains(',', regex=False).fillna(False)
+        has_dot = cleaned.str.contains('.', regex=False).fillna(False)
+        # Comma alongside a dot is a thousands separator; comma alone is a
+        # decimal separator
+        cleaned = cleaned.mask(has_comma & has_dot, cleaned.str.replace(',', '', regex=False))
+        cleaned = cleaned.mask(has_comma & ~has_dot, cleaned.str.replace(',', '.', regex=False))
+
+        return pd.to_numeric(cleaned, errors='coerce')
     
     def _process_variant_attributes(self, result_df: pd.DataFrame, source_df: pd.DataFrame, mapping: Dict[str, str]) -> pd.DataFrame:
         """Process variant attributes into JSON format."""
@@ -451,55 +604,64 @@ class SalaazConverter:
                 variant_columns.append(col)
         
         if variant_columns:
+            # Clean each attribute name once, then strip whole columns at a
+            # time instead of materializing a Series per row via iterrows
+            clean_names = {
+                col: _ATTR_CLEAN_RE.sub('', col.lower().replace(' ', '_'))
+                for col in variant_columns
+            }
+            cols_data = {
+                clean_names[col]: source_df[col].astype('string').str.strip()
+                for col in variant_columns
+            }
+            records = pd.DataFrame(cols_data).to_dict(orient='records')
+
             variant_attrs = []
-            for idx, row in source_df.iterrows():
-                attrs = {}
-                for col in variant_columns:
-                    value = row[col]
-                    if pd.notna(value) and str(value).strip():
-                        # Create a clean attribute name
-                        attr_name = col.lower().replace(' ', '_')
-                        attr_name = re.sub(r'[^\w]', '', attr_name)
-                        attrs[attr_name] = str(value).strip()
-                
-                variant_attrs.append(json.dumps(attrs) if attrs else None)
-            
+            for record in records:
+                attrs = {name: value for name, value in record.items()
+                         if pd.notna(value) and value}
+                variant_attrs.append(_json_dumps(attrs) if attrs else None)
+
             result_df['variant_attributes'] = variant_attrs
-        
+
         return result_df
     
-    def _clean_image_urls(self, image_value) -> Optional[str]:
-        """Clean and format image URLs."""
-        if pd.isna(image_value):
-            return None
-        
-        image_str = str(image_value).strip()
-        if not image_str:
-            return None
-        
-        # Split multiple URLs by common separators
-        urls = re.split(r'[;,\|\n]', image_str)
-        
-        # Clean and validate URLs
-        clean_urls = []
-        for url in urls:
-            url = url.strip()
-            if url and (url.startswith('http') or url.startswith('https')):
-                clean_urls.append(url)
-        
-        return ','.join(clean_urls) if clean_urls else None
+    def _clean_image_urls_series(self, images: pd.Series) -> pd.Series:
+        """Clean and format a whole image URL column in one vectorized pass."""
+        # Split multiple URLs by common separators and flatten to one URL per row
+        exploded = images.astype('string').str.split(_URL_SPLIT_RE, regex=True).explode().str.strip()
+
+        # Keep only valid http(s) URLs, then reaggregate per original row
+        valid = exploded[exploded.str.startswith('http', na=False)]
+        joined = valid.groupby(level=0).agg(','.join)
+
+        # Rows with no valid URL come back as missing
+        return joined.reindex(images.index)
     
+    @staticmethod
+    def _fill_missing(series: pd.Series, default: int) -> pd.Series:
+        """Fill missing values with a default matching the column's dtype."""
+        if not series.isna().any():
+            return series
+        if pd.api.types.is_numeric_dtype(series.dtype):
+            return series.fillna(default)
+        return series.fillna(str(default))
+
     def _set_default_values(self, result_df: pd.DataFrame) -> pd.DataFrame:
         """Set default values for required fields when missing."""
-        
+
         # Set default category_id if missing (you may want to customize this)
         if 'category_id' in result_df.columns:
-            result_df['category_id'] = result_df['category_id'].fillna('1')  # Default category
-        
-        # Set default variant quantity
+            result_df['category_id'] = self._fill_missing(result_df['category_id'], 1)  # Default category
+
+        # Set default variant quantity, coerced to the smallest integer
+        # dtype that fits once the missing values are filled. Coerce through
+        # object so failures surface as fillable nulls rather than the NaN
+        # values an Arrow-backed column would produce
         if 'variant_quantity' in result_df.columns:
-            result_df['variant_quantity'] = result_df['variant_quantity'].fillna('0')
-        
+            quantity = pd.to_numeric(result_df['variant_quantity'].astype(object), errors='coerce')
+            result_df['variant_quantity'] = pd.to_numeric(quantity.fillna(0), downcast='integer')
+
         return result_df
     
     def validate_salaaz_data(self, df: pd.DataFrame) -> Dict[str, Any]:
@@ -516,36 +678,180 @@ class SalaazConverter:
                 if missing_count > 0:
                     issues.append(f"Column '{col}' has {missing_count} missing values")
         
-        # Validate data types and formats
+        # Validate data types and formats - count values that fail numeric
+        # coercion in one vectorized pass rather than per-row try/except
         if 'price' in df.columns:
-            invalid_prices = 0
-            for price in df['price'].dropna():
-                try:
-                    float(price)
-                except (ValueError, TypeError):
-                    invalid_prices += 1
+            invalid_prices = int(pd.to_numeric(df['price'], errors='coerce').isna().sum()
+                                 - df['price'].isna().sum())
             if invalid_prices > 0:
                 warnings.append(f"{invalid_prices} rows have invalid price format")
-        
+
         if 'category_id' in df.columns:
-            invalid_categories = 0
-            for cat_id in df['category_id'].dropna():
-                try:
-                    int(cat_id)
-                except (ValueError, TypeError):
-                    invalid_categories += 1
+            invalid_categories = int(pd.to_numeric(df['category_id'], errors='coerce').isna().sum()
+                                     - df['category_id'].isna().sum())
             if invalid_categories > 0:
                 warnings.append(f"{invalid_categories} rows have invalid category_id format")
         
+        total_rows = len(df)
+        complete_rows = len(df.dropna(subset=self.SALAAZ_REQUIRED_COLUMNS))
         return {
             'valid': len(issues) == 0,
             'issues': issues,
             'warnings': warnings,
-            'total_rows': len(df),
-            'complete_rows': len(df.dropna(subset=self.SALAAZ_REQUIRED_COLUMNS))
+            'total_rows': total_rows,
+            'complete_rows': complete_rows,
+            'valid_pct': 100.0 * complete_rows / total_rows if total_rows else 0.0
         }
 
 
+@st.cache_data(show_spinner=False)
+def _detect_platform_cached(columns: Tuple[str, ...], _converter: SalaazConverter) -> Optional[str]:
+    """Cache platform detection per column tuple across Streamlit reruns."""
+    return _converter._detect_platform_impl(list(columns))
+
+
+@st.cache_data(show_spinner=False)
+def _suggest_mapping_cached(source_columns: Tuple[str, ...], platform: Optional[str],
+                            _converter: SalaazConverter) -> Dict[str, str]:
+    """Cache mapping suggestions per (columns, platform) across reruns."""
+    return _converter._suggest_mapping_impl(list(source_columns), platform)
+
+
+@st.cache_data(show_spinner=False)
+def _read_df(file_key: str, name: str, _raw: bytes) -> pd.DataFrame:
+    """
+    Parse an uploaded file once per content hash.
+
+    The raw bytes are passed with an underscore name so Streamlit keys the
+    cache on the precomputed hash instead of re-hashing the payload.
+    """
+    if name.endswith('.csv'):
+        if pacsv is not None:
+            # pyarrow's multi-threaded CSV reader is several times faster
+            # than the pandas parser on large exports
+            df = pacsv.read_csv(io.BytesIO(_raw)).to_pandas(types_mapper=pd.ArrowDtype)
+        else:
+            df = pd.read_csv(io.BytesIO(_raw))
+    elif _HAS_CALAMINE:
+        # calamine reads both .xlsx and .xls far faster than openpyxl
+        df = pd.read_excel(io.BytesIO(_raw), engine='calamine')
+    else:
+        # Pin the engine for .xlsx so pandas skips content sniffing;
+        # legacy .xls still goes through engine inference (xlrd)
+        engine = 'openpyxl' if name.endswith('.xlsx') else None
+        df = pd.read_excel(io.BytesIO(_raw), engine=engine)
+
+    # Arrow-backed dtypes keep large text columns compact and let the
+    # downstream .str cleaning passes run on Arrow kernels; without
+    # pyarrow fall back to the default nullable dtypes
+    if pa is not None:
+        return df.convert_dtypes(dtype_backend='pyarrow')
+    return df.convert_dtypes()
+
+
+@st.cache_data(show_spinner=False)
+def _analyze(file_key: str, name: str, _raw: bytes,
+             _converter: SalaazConverter) -> Tuple[pd.DataFrame, Optional[str], List[str]]:
+    """Read the upload, detect its platform, and list its columns once per content hash."""
+    df = _read_df(file_key, name, _raw)
+    columns = df.columns.tolist()
+    return df, _converter.detect_platform(columns), columns
+
+
+@st.cache_data(show_spinner=False)
+def _cached_validate(file_key: str, mapping_tuple: Tuple[Tuple[str, str], ...],
+                     platform: Optional[str], _df: pd.DataFrame,
+                     _converter: SalaazConverter) -> Dict[str, Any]:
+    """Cache validation results per (file, mapping, platform)."""
+    return _converter.validate_salaaz_data(_df)
+
+
+@st.cache_data(show_spinner=False)
+def _cached_transform(file_key: str, mapping_tuple: Tuple[Tuple[str, str], ...],
+                      platform: Optional[str], _df: pd.DataFrame,
+                      _converter: SalaazConverter) -> pd.DataFrame:
+    """
+    Cache the transformed frame per (file, mapping, platform).
+
+    The frame and converter are passed with underscore names so Streamlit
+    keys the cache on the cheap file hash and mapping tuple instead of
+    hashing the whole DataFrame.
+    """
+    return _converter.transform_data(_df, dict(mapping_tuple), platform)
+
+
+@st.cache_data(show_spinner=False)
+def _to_csv_bytes(file_key: str, mapping_tuple: Tuple[Tuple[str, str], ...],
+                  platform: Optional[str], _df: pd.DataFrame) -> bytes:
+    """Cache the CSV download payload per (file, mapping, platform)."""
+    if pacsv is not None:
+        # Arrow writes the CSV straight into the bytes buffer, skipping the
+        # per-cell Python strings that DataFrame.to_csv materializes
+        buf = io.BytesIO()
+        pacsv.write_csv(pa.Table.from_pandas(_df, preserve_index=False), buf)
+        return buf.getvalue()
+
+    # Fallback: stream to_csv straight into a bytes buffer so the payload is
+    # encoded once instead of round-tripping through one giant str
+    buf = io.BytesIO()
+    wrapper = io.TextIOWrapper(buf, encoding='utf-8', newline='')
+    _df.to_csv(wrapper, index=False)
+    wrapper.flush()
+    return buf.getvalue()
+
+
+@st.cache_data(show_spinner=False)
+def _to_xlsx_bytes(file_key: str, mapping_tuple: Tuple[Tuple[str, str], ...],
+                   platform: Optional[str], _df: pd.DataFrame) -> bytes:
+    """Cache the Excel download payload per (file, mapping, platform)."""
+    excel_buffer = io.BytesIO()
+    if FastExcel is not None:
+        # The Rust writer streams rows with constant memory
+        FastExcel(excel_buffer, autofit=False).sheet('Products', _df).save()
+    elif _HAS_XLSXWRITER:
+        # constant_memory discards each row after writing it, avoiding the
+        # full in-memory cell tree; skipping URL conversion avoids a
+        # per-cell regex on the URL-heavy product columns
+        with pd.ExcelWriter(excel_buffer, engine='xlsxwriter',
+                            engine_kwargs={'options': {'constant_memory': True,
+                                                       'strings_to_urls': False}}) as writer:
+            _df.to_excel(writer, index=False, sheet_name='Products')
+    else:
+        with pd.ExcelWriter(excel_buffer, engine='openpyxl') as writer:
+            _df.to_excel(writer, index=False, sheet_name='Products')
+    return excel_buffer.getvalue()
+
+
+@st.cache_resource(show_spinner=False)
+def _load_all_categories() -> Tuple[Optional[pd.DataFrame], Optional[pd.DataFrame], Optional[pd.DataFrame]]:
+    """
+    Read and prepare the category mapping CSVs once per server process.
+
+    Streamlit recreates SalaazConverter on every rerun; caching the parsed
+    frames (with their precomputed lowercase names and keyword terms) avoids
+    re-reading and re-parsing the same files on each interaction.
+    """
+    def _prepare(path: str, names: List[str]) -> Optional[pd.DataFrame]:
+        if not os.path.exists(path):
+            return None
+        df = pd.read_csv(path, header=None, names=names)
+        df['_name_lc'] = df['name'].astype(str).str.lower().str.strip()
+        df['_kw_terms'] = df['_name_lc'].map(SalaazConverter._extract_keyword_terms)
+        return df
+
+    categories_df = _prepare(
+        'categories.csv',
+        ['id', 'name', 'description', 'active', 'created_at', 'updated_at'])
+    sub_categories_df = _prepare(
+        'sub_categories.csv',
+        ['id', 'name', 'description', 'active', 'created_at', 'updated_at', 'category_id'])
+    sub_sub_categories_df = _prepare(
+        'sub_sub_categories.csv',
+        ['id', 'name', 'description', 'active', 'created_at', 'updated_at', 'sub_category_id'])
+
+    return categories_df, sub_categories_df, sub_sub_categories_df
+
+
 def main():
     """Main Streamlit application."""
     
@@ -628,20 +934,23 @@ def main():
     
     if uploaded_file is not None:
         try:
-            # Read the uploaded file
-            if uploaded_file.name.endswith('.csv'):
-                df = pd.read_csv(uploaded_file)
-            else:
-                df = pd.read_excel(uploaded_file)
-            
-            st.success(f"✅ File uploaded successfully! Found {len(df)} rows and {len(df.columns)} columns.")
-            
+            # Read the raw bytes once; the content hash keys every cached step
+            raw = uploaded_file.getvalue()
+            file_key = _content_key(raw)
+
+            # Read the file, detect the platform, and materialize the column
+            # list in one cached step; detection, suggestions, and the
+            # mapping options all reuse them
+            df, detected_platform, source_columns = _analyze(file_key, uploaded_file.name,
+                                                             raw, converter)
+
+            st.success(f"✅ File uploaded successfully! Found {len(df)} rows and {len(source_columns)} columns.")
+
             # Display file preview
             with st.expander("📊 File Preview", expanded=True):
                 st.dataframe(df.head(10))
             
             # Detect platform
-            detected_platform = converter.detect_platform(df.columns.tolist())
             if detected_platform:
                 st.info(f"🎯 Detected platform: **{detected_platform.title()}**")
             else:
@@ -651,70 +960,39 @@ def main():
             st.header("🗺️ Step 2: Column Mapping")
             
             # Get suggested mapping
-            suggested_mapping = converter.suggest_mapping(df.columns.tolist(), detected_platform)
-            
-            # Create mapping interface
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                st.subheader("Salaaz Fields")
-            with col2:
-                st.subheader("Your File Columns")
+            suggested_mapping = converter.suggest_mapping(source_columns, detected_platform)
             
             # Initialize session state for mapping
             if 'column_mapping' not in st.session_state:
                 st.session_state.column_mapping = suggested_mapping
-            
-            mapping = {}
-            
-            # Required fields mapping
-            st.markdown("### ⚡ Required Fields")
-            for salaaz_field in converter.SALAAZ_REQUIRED_COLUMNS:
-                col1, col2 = st.columns(2)
-                with col1:
-                    st.code(salaaz_field)
-                with col2:
-                    current_mapping = st.session_state.column_mapping.get(salaaz_field, "")
-                    options = [""] + df.columns.tolist()
-                    
-                    try:
-                        default_index = options.index(current_mapping) if current_mapping in options else 0
-                    except ValueError:
-                        default_index = 0
-                    
-                    selected = st.selectbox(
-                        f"Map to:",
-                        options,
-                        index=default_index,
-                        key=f"mapping_{salaaz_field}"
-                    )
-                    if selected:
-                        mapping[salaaz_field] = selected
-            
-            # Optional fields mapping
-            with st.expander("🔧 Optional Fields Mapping"):
-                for salaaz_field in converter.SALAAZ_OPTIONAL_COLUMNS:
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        st.code(salaaz_field)
-                    with col2:
-                        current_mapping = st.session_state.column_mapping.get(salaaz_field, "")
-                        options = [""] + df.columns.tolist()
-                        
-                        try:
-                            default_index = options.index(current_mapping) if current_mapping in options else 0
-                        except ValueError:
-                            default_index = 0
-                        
-                        selected = st.selectbox(
-                            f"Map to:",
-                            options,
-                            index=default_index,
-                            key=f"mapping_optional_{salaaz_field}"
-                        )
-                        if selected:
-                            mapping[salaaz_field] = selected
-            
+
+            # One editable table instead of a widget per Salaaz field - a
+            # single component render per rerun
+            options = [""] + source_columns
+            current = st.session_state.column_mapping
+            mapping_fields = converter.SALAAZ_REQUIRED_COLUMNS + converter.SALAAZ_OPTIONAL_COLUMNS
+            map_df = pd.DataFrame({
+                'Salaaz field': mapping_fields,
+                'Required': ['⚡' if f in converter.SALAAZ_REQUIRED_SET else '' for f in mapping_fields],
+                'Source column': [current.get(f, '') if current.get(f, '') in options else ''
+                                  for f in mapping_fields],
+            })
+            edited = st.data_editor(
+                map_df,
+                column_config={
+                    'Salaaz field': st.column_config.TextColumn('Salaaz field', disabled=True),
+                    'Required': st.column_config.TextColumn('Required', disabled=True),
+                    'Source column': st.column_config.SelectboxColumn('Source column', options=options),
+                },
+                hide_index=True,
+                num_rows='fixed',
+                use_container_width=True,
+                key='mapping_editor'
+            )
+
+            mapping = {field: source for field, source
+                       in zip(edited['Salaaz field'], edited['Source column']) if source}
+
             # Update session state
             st.session_state.column_mapping = mapping
             
@@ -722,11 +1000,26 @@ def main():
             if mapping:
                 st.header("🔄 Step 3: Data Transformation")
                 
-                with st.spinner("Transforming data..."):
-                    transformed_df = converter.transform_data(df, mapping, detected_platform)
-                
-                # Validate transformed data
-                validation_result = converter.validate_salaaz_data(transformed_df)
+                mapping_tuple = tuple(sorted(mapping.items()))
+
+                # Session state short-circuits even the cache lookup (and the
+                # frame copy a cache_data hit makes) when nothing changed
+                cache_token = (file_key, mapping_tuple, detected_platform)
+                if st.session_state.get('convert_token') == cache_token:
+                    transformed_df = st.session_state.convert_df
+                    validation_result = st.session_state.convert_validation
+                else:
+                    with st.spinner("Transforming data..."):
+                        transformed_df = _cached_transform(file_key, mapping_tuple,
+                                                           detected_platform, df, converter)
+
+                    # Validate transformed data (cached alongside the transform)
+                    validation_result = _cached_validate(file_key, mapping_tuple,
+                                                         detected_platform, transformed_df, converter)
+
+                    st.session_state.convert_token = cache_token
+                    st.session_state.convert_df = transformed_df
+                    st.session_state.convert_validation = validation_result
                 
                 # Display validation results
                 col1, col2, col3 = st.columns(3)
@@ -735,19 +1028,17 @@ def main():
                 with col2:
                     st.metric("Complete Rows", validation_result['complete_rows'])
                 with col3:
-                    valid_percentage = (validation_result['complete_rows'] / validation_result['total_rows']) * 100
-                    st.metric("Valid %", f"{valid_percentage:.1f}%")
+                    st.metric("Valid %", f"{validation_result['valid_pct']:.1f}%")
                 
                 # Show validation issues
+                # One message per severity instead of one per finding
                 if validation_result['issues']:
-                    st.error("❌ Validation Issues:")
-                    for issue in validation_result['issues']:
-                        st.write(f"• {issue}")
-                
+                    st.error("❌ Validation Issues:\n\n"
+                             + "\n".join(f"• {issue}" for issue in validation_result['issues']))
+
                 if validation_result['warnings']:
-                    st.warning("⚠️ Warnings:")
-                    for warning in validation_result['warnings']:
-                        st.write(f"• {warning}")
+                    st.warning("⚠️ Warnings:\n\n"
+                               + "\n".join(f"• {warning}" for warning in validation_result['warnings']))
                 
                 if validation_result['valid']:
                     st.success("✅ Data validation passed!")
@@ -762,14 +1053,20 @@ def main():
                 with col2:
                     preview_rows = st.slider("Rows to preview", 5, 50, 10)
                 
+                # Trim to the preview rows before projecting columns so the
+                # intermediate frame stays small
                 if show_all_columns:
-                    preview_df = transformed_df.head(preview_rows)
+                    preview_df = transformed_df.iloc[:preview_rows]
                 else:
-                    # Show only mapped columns
-                    mapped_columns = [col for col in converter.ALL_SALAAZ_COLUMNS if col in mapping.keys()]
-                    preview_df = transformed_df[mapped_columns].head(preview_rows)
-                
-                st.dataframe(preview_df)
+                    # Show only mapped columns, in canonical Salaaz order
+                    mapped_columns = [col for col in converter.ALL_SALAAZ_COLUMNS if col in mapping]
+                    preview_df = transformed_df.iloc[:preview_rows].loc[:, mapped_columns]
+
+                # Arrow-backed dtypes let Streamlit's serializer take the
+                # zero-copy path; converting the small slice is cheap
+                if pa is not None:
+                    preview_df = preview_df.convert_dtypes(dtype_backend='pyarrow')
+                st.dataframe(preview_df, use_container_width=True, hide_index=True)
                 
                 # Download section
                 st.header("💾 Step 5: Download Converted File")
@@ -777,11 +1074,10 @@ def main():
                 col1, col2 = st.columns(2)
                 
                 with col1:
-                    # CSV download
-                    csv_buffer = io.StringIO()
-                    transformed_df.to_csv(csv_buffer, index=False)
-                    csv_data = csv_buffer.getvalue()
-                    
+                    # CSV download (serialized once per unique input)
+                    csv_data = _to_csv_bytes(file_key, mapping_tuple,
+                                             detected_platform, transformed_df)
+
                     st.download_button(
                         label="📄 Download as CSV",
                         data=csv_data,
@@ -790,25 +1086,24 @@ def main():
                     )
                 
                 with col2:
-                    # Excel download
-                    excel_buffer = io.BytesIO()
-                    with pd.ExcelWriter(excel_buffer, engine='openpyxl') as writer:
-                        transformed_df.to_excel(writer, index=False, sheet_name='Products')
-                    
+                    # Excel download (serialized once per unique input)
+                    excel_data = _to_xlsx_bytes(file_key, mapping_tuple,
+                                                detected_platform, transformed_df)
+
                     st.download_button(
                         label="📊 Download as Excel",
-                        data=excel_buffer.getvalue(),
+                        data=excel_data,
                         file_name=f"salaaz_products_{uploaded_file.name.split('.')[0]}.xlsx",
                         mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
                     )
                 
-                # Statistics
-                with st.expander("📈 Conversion Statistics"):
+                # Statistics - only computed when the user asks for them
+                if st.checkbox("📈 Show conversion statistics"):
                     st.json({
                         "Original Columns": len(df.columns),
                         "Mapped Columns": len(mapping),
-                        "Required Fields Mapped": len([k for k in mapping.keys() if k in converter.SALAAZ_REQUIRED_COLUMNS]),
-                        "Optional Fields Mapped": len([k for k in mapping.keys() if k in converter.SALAAZ_OPTIONAL_COLUMNS]),
+                        "Required Fields Mapped": len(mapping.keys() & converter.SALAAZ_REQUIRED_SET),
+                        "Optional Fields Mapped": len(mapping.keys() & converter.SALAAZ_OPTIONAL_SET),
                         "Rows Processed": len(transformed_df),
                         "Platform Detected": detected_platform or "Unknown"
                     })
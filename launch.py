@@ -4,21 +4,33 @@ Launch script for the Salaaz CSV Converter Streamlit app.
 This script is completely separate from the Django application.
 """
 
+import hashlib
 import subprocess
 import sys
 import os
 from pathlib import Path
 
 def install_requirements():
-    """Install required packages if they're not already installed."""
+    """Install required packages, skipping pip when requirements are unchanged."""
     requirements_file = Path(__file__).parent / "requirements.txt"
-    
+    sentinel_file = Path(__file__).parent / ".requirements.sha"
+
     if requirements_file.exists():
+        # Skip the multi-second pip subprocess when the sentinel records the
+        # same requirements hash as the last successful install
+        requirements_hash = hashlib.blake2b(requirements_file.read_bytes(), digest_size=16).hexdigest()
+        if sentinel_file.exists() and sentinel_file.read_text().strip() == requirements_hash:
+            print("✅ Requirements unchanged, skipping install")
+            return True
+
         print("Installing required packages...")
         try:
             subprocess.check_call([
-                sys.executable, "-m", "pip", "install", "-r", str(requirements_file)
+                sys.executable, "-m", "pip", "install",
+                "--disable-pip-version-check", "--no-input",
+                "-r", str(requirements_file)
             ])
+            sentinel_file.write_text(requirements_hash)
             print("✅ Requirements installed successfully!")
         except subprocess.CalledProcessError as e:
             print(f"❌ Failed to install requirements: {e}")